@@ -4,31 +4,691 @@ Web UI for the Auto Debugger using Flask
 Run with: python debug_web_ui.py
 """
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import (Flask, Response, make_response, request, jsonify,
+                   stream_with_context)
+import gzip
+import hashlib
 import os
+import queue
+import re
+import signal
+import subprocess
 import tempfile
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
 import traceback
 from error_analyzer import AutoDebugger
 
+# Optional semantic-cache dependencies (cache degrades to exact-match only
+# when these aren't installed)
+try:
+    import faiss
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+# Optional L2 cache backend (survives restarts, shared across workers)
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# orjson is noticeably faster for (de)serializing large fix payloads
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import json
+
+# brotli compresses the index page ~15-20% smaller than gzip; optional
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# resource limits for run-code workers (Unix only)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# No sessions: the only per-client state is whether the debugger has been
+# configured, and the module-level instance already gates that. Skipping
+# cookies avoids the per-request HMAC sign/verify and Set-Cookie bytes.
 app = Flask(__name__)
-app.secret_key = 'your-secret-key-change-this'
 
-# Global debugger instance (will be initialized when API key is provided)
+if orjson is not None:
+    from flask.json.provider import DefaultJSONProvider
+
+    class ORJSONProvider(DefaultJSONProvider):
+        """jsonify via orjson - ~3-5x faster than stdlib json, which adds
+        up on fix payloads carrying whole source files"""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
+
+
+def _request_json():
+    """Parse the POST body, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(request.get_data())
+    return request.get_json()
+
+# Global debugger instance (will be initialized when API key is provided).
+# The in-browser key flow only reaches the worker that handled the POST,
+# so under gunicorn -w N the key must come from the environment instead -
+# with --preload every forked worker then shares this instance.
 debugger = None
+if os.getenv('OPENROUTER_API_KEY'):
+    debugger = AutoDebugger(os.getenv('OPENROUTER_API_KEY'))
+
+# Two-tier fix cache: L1 is an in-process LRU (fast, lost on restart),
+# L2 is an optional Redis instance (survives restarts, shared across
+# workers when running under gunicorn). Keyed by sha256 of the normalized
+# code plus the model name.
+ENABLE_FIX_CACHE = os.getenv('ENABLE_FIX_CACHE', '1') == '1'
+_fix_cache = OrderedDict()
+_FIX_CACHE_MAX = 500
+_FIX_CACHE_TTL = 7 * 24 * 3600  # L2 entries expire after a week
+
+_redis = None
+if redis is not None and os.getenv('REDIS_URL'):
+    try:
+        _redis = redis.Redis.from_url(os.getenv('REDIS_URL'))
+    except Exception as e:
+        print(f"Warning: could not connect to Redis, L2 cache disabled: {e}")
+
+
+def _dumps_fix(fix_dict):
+    """Serialize a fix dict for the L2 cache"""
+    if orjson is not None:
+        return orjson.dumps(fix_dict)
+    return json.dumps(fix_dict).encode('utf-8')
+
+
+def _loads_fix(data):
+    """Deserialize a fix dict from the L2 cache"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Compiled once - matched against stderr on every /api/run-code request
+_TB_RE = re.compile(r'File "([^"]+)", line (\d+)')
+
+# Persistent worker pool for /api/run-code. Each request used to pay the
+# Python interpreter's cold start (~30-80 ms) before the user's code even
+# ran; a pool of long-lived workers amortizes that across requests.
+_RUN_TIMEOUT = 10  # wall-clock seconds per snippet
+_WORKER_POOL_SIZE = int(os.getenv('RUN_CODE_WORKERS', '4'))
+_WORKER_SENTINEL = '---auto-debugger-request-done---'
+
+# Each worker loops reading a length-prefixed code block from stdin, execs
+# it in a fresh namespace, then emits a sentinel line on both streams so
+# the parent knows the request is finished.
+_WORKER_SOURCE = f"""\
+import sys, traceback
+while True:
+    header = sys.stdin.readline()
+    if not header:
+        break
+    code = sys.stdin.read(int(header))
+    try:
+        exec(compile(code, '<web>', 'exec'), {{'__name__': '__main__'}})
+    except SystemExit:
+        pass
+    except BaseException as e:
+        # Skip the worker's own exec frame so the user only sees their code
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    print({_WORKER_SENTINEL!r}, flush=True)
+    print({_WORKER_SENTINEL!r}, file=sys.stderr, flush=True)
+"""
+
+_worker_queue = None
+_worker_lock = threading.Lock()
+
+
+def _worker_limits():
+    """Cap worker resources so user code can't exhaust the host.
+
+    Runs in the child between fork and exec. Without this, a snippet
+    like x = 'a' * 10**10 OOM-kills the whole box rather than just the
+    worker. The CPU cap is a lifetime backstop - the wall-clock timeout
+    is the primary guard and replaces the worker when it fires.
+    """
+    resource.setrlimit(resource.RLIMIT_AS, (512 * 1024 * 1024,) * 2)
+    resource.setrlimit(resource.RLIMIT_FSIZE, (10 * 1024 * 1024,) * 2)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (256, 256))
+    resource.setrlimit(resource.RLIMIT_CPU, (60, 60))
+
+
+def _spawn_worker():
+    """Start one long-lived Python worker process"""
+    return subprocess.Popen(
+        ['python', '-u', '-c', _WORKER_SOURCE],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE, text=True,
+        preexec_fn=_worker_limits if resource is not None else None,
+        start_new_session=True
+    )
+
+
+def _kill_worker(worker):
+    """Kill a worker and anything it spawned (it leads its own session)"""
+    try:
+        os.killpg(worker.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        worker.kill()
+
+
+def _get_worker_pool():
+    """Lazily create the worker pool (keeps module import cheap)"""
+    global _worker_queue
+    if _worker_queue is None:
+        with _worker_lock:
+            if _worker_queue is None:
+                pool = queue.Queue()
+                for _ in range(_WORKER_POOL_SIZE):
+                    pool.put(_spawn_worker())
+                _worker_queue = pool
+    return _worker_queue
+
+
+# Pump-end marker for a stream that hit EOF before the sentinel - the
+# worker died mid-request (rlimit, OOM kill) rather than finishing
+_WORKER_DIED = object()
+
+
+def _pump_stream(stream, name, events):
+    """Forward worker stream lines into the event queue until the sentinel"""
+    saw_sentinel = False
+    for line in stream:
+        stripped = line.rstrip('\n')
+        if stripped.endswith(_WORKER_SENTINEL):
+            # A final write without a trailing newline glues onto the
+            # sentinel line; forward that prefix before finishing so the
+            # user still sees their last output
+            prefix = stripped[:-len(_WORKER_SENTINEL)]
+            if prefix:
+                events.put((name, prefix))
+            saw_sentinel = True
+            break
+        events.put((name, line))
+    events.put((name, None if saw_sentinel else _WORKER_DIED))
+
+
+def _stream_run_events(code, filename):
+    """Run code on a pooled worker, yielding output events as they arrive.
+
+    Streaming instead of buffering keeps peak memory flat for chatty
+    scripts and cuts time-to-first-byte from 'whole script runtime' to
+    'first print'. A final event carries the parsed error location.
+    """
+    pool = _get_worker_pool()
+    worker = pool.get()
+    if worker.poll() is not None:  # died on a previous request
+        worker = _spawn_worker()
+    healthy = True
+    try:
+        try:
+            worker.stdin.write(f"{len(code)}\n{code}")
+            worker.stdin.flush()
+        except OSError:
+            healthy = False
+            yield {'success': False, 'error': 'Worker process unavailable, please retry'}
+            return
+
+        events = queue.Queue()
+        readers = [
+            threading.Thread(target=_pump_stream,
+                             args=(worker.stdout, 'stdout', events), daemon=True),
+            threading.Thread(target=_pump_stream,
+                             args=(worker.stderr, 'stderr', events), daemon=True),
+        ]
+        for t in readers:
+            t.start()
+
+        deadline = time.monotonic() + _RUN_TIMEOUT
+        finished = set()
+        stderr_parts = []
+        timed_out = False
+        worker_died = False
+        while len(finished) < 2:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            try:
+                name, line = events.get(timeout=remaining)
+            except queue.Empty:
+                timed_out = True
+                break
+            if line is None or line is _WORKER_DIED:
+                finished.add(name)
+                if line is _WORKER_DIED:
+                    worker_died = True
+                continue
+            if name == 'stderr':
+                # The worker compiles piped code as <web>; show the
+                # user's filename instead
+                line = line.replace('File "<web>"', f'File "{filename}"')
+                stderr_parts.append(line)
+            yield {'stream': name, 'data': line}
+
+        if timed_out:
+            # Kill the stuck worker (and its children); the readers see
+            # EOF and exit
+            healthy = False
+            _kill_worker(worker)
+            for t in readers:
+                t.join(1)
+            yield {'stream': 'stderr',
+                   'data': f'Execution timed out after {_RUN_TIMEOUT} seconds\n'}
+        elif worker_died:
+            # EOF before the sentinel: the worker was killed mid-request
+            # (resource limit, OOM). Say so instead of reporting the
+            # truncated output as a clean run.
+            healthy = False
+            yield {'stream': 'stderr',
+                   'data': 'Worker process died during execution '
+                           '(resource limit exceeded?); output may be truncated\n'}
+
+        # Parse the collected stderr for the last 'File ...' location
+        error_file = None
+        error_line = None
+        last = None
+        for last in _TB_RE.finditer(''.join(stderr_parts)):
+            pass
+        if last is not None:
+            error_file = last.group(1)
+            error_line = int(last.group(2))
+        yield {
+            'done': True,
+            'success': not worker_died,
+            'timed_out': timed_out,
+            'error_file': error_file,
+            'error_line': error_line
+        }
+    finally:
+        if healthy and worker.poll() is None:
+            pool.put(worker)
+        else:
+            pool.put(_spawn_worker())
+
+
+def _temp_code_dir():
+    """Directory for temp code files - prefer tmpfs so writes never hit disk"""
+    if os.path.exists('/dev/shm'):
+        return Path('/dev/shm') / 'auto_debugger'
+    return Path(tempfile.gettempdir()) / 'auto_debugger'
+
+
+def _write_code_file(path, code):
+    """Write a small code file in one raw syscall.
+
+    Skips the TextIOWrapper/BufferedWriter layers that write_text sets
+    up - for a <10 KB snippet that's three layers of overhead for a
+    single write. 0o600 since the content is user-submitted.
+    """
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, code.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
+def _normalize_code(code):
+    """Normalize code for cache keying (trailing whitespace is irrelevant)"""
+    return '\n'.join(line.rstrip() for line in code.strip().splitlines())
+
+
+def _fix_cache_key(code, model):
+    """Build the exact-match cache key for a code submission"""
+    normalized = _normalize_code(code)
+    code_hash = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    return f"fix:{code_hash}:{model}"
+
+
+# Debug jobs run in a process pool: executing the submission and parsing
+# the LLM response are CPU work that would otherwise hold this process's
+# GIL and stall every other request.
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+# Per-pool-worker debugger instances, keyed by (api_key, model). Lives in
+# the child processes; reusing instances keeps their HTTP sessions warm.
+_pool_debuggers = {}
+
+
+def _pool_preload():
+    """Pool initializer: import the analyzer once per child at startup"""
+    import error_analyzer  # noqa: F401
+
+    # Forked children inherit the parent's class-level requests.Session -
+    # including any live TLS socket _prewarm parked in its pool. Several
+    # children writing on one shared connection interleave TLS records,
+    # so drop the inherited session and let each child build its own.
+    error_analyzer.LLMAnalyzer._session = None
+
+
+def _get_process_pool():
+    """Lazily create the debug-job process pool"""
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count(), initializer=_pool_preload
+                )
+    return _process_pool
+
+
+def _pool_auto_fix(api_key, model, temp_path):
+    """Run one debug job inside a pool worker, returning a fix dict"""
+    key = (api_key, model)
+    job_debugger = _pool_debuggers.get(key)
+    if job_debugger is None:
+        job_debugger = AutoDebugger(api_key)
+        job_debugger.analyzer.model = model
+        _pool_debuggers[key] = job_debugger
+    fix_suggestion = job_debugger.auto_fix_code(temp_path)
+    if fix_suggestion is None:
+        return None
+    return _fix_to_dict(fix_suggestion)
+
+
+def _compute_fix(code, filename):
+    """Run the debugger on a code submission, returning a fix dict.
+
+    Returns None when the code executed without errors. This is the
+    expensive (LLM-calling) path; callers go through _single_flight_fix
+    so concurrent identical submissions only pay it once.
+    """
+    temp_dir = _temp_code_dir()
+    temp_dir.mkdir(exist_ok=True)
+
+    temp_file = temp_dir / f"{uuid.uuid4().hex}_{filename}"
+    _write_code_file(temp_file, code)
+
+    try:
+        _record_stat('cache_misses')
+        start = time.perf_counter()
+        fix_dict = _get_process_pool().submit(
+            _pool_auto_fix,
+            debugger.analyzer.api_key, debugger.analyzer.model,
+            str(temp_file)
+        ).result()
+        if fix_dict is None:
+            return None
+        _record_stat('llm_calls')
+        _record_stat('llm_seconds', time.perf_counter() - start)
+        return fix_dict
+    finally:
+        # Clean up temp file
+        if temp_file.exists():
+            temp_file.unlink()
+
+
+def _fix_to_dict(fix_suggestion):
+    """Serialize a FixSuggestion into the JSON-friendly response dict"""
+    return {
+        'analysis': fix_suggestion.analysis,
+        'root_cause': fix_suggestion.root_cause,
+        'fix_description': fix_suggestion.fix_description,
+        'confidence': fix_suggestion.confidence,
+        'replication_steps': fix_suggestion.replication_steps,
+        'file_changes': fix_suggestion.file_changes
+    }
+
+
+def _is_llm_failure(fix_dict):
+    """True for the zero-confidence sentinel LLMAnalyzer returns when the
+    call itself failed (timeouts, exhausted retries). Those must never be
+    cached - a transient outage would otherwise keep answering for a week.
+    """
+    return not fix_dict.get('file_changes') and fix_dict.get('confidence', 0) == 0
+
+
+# Single-flight map: when two identical submissions race on a cache miss,
+# the first computes and the rest block on its Future instead of firing
+# duplicate LLM calls.
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _single_flight_fix(cache_key, code, filename):
+    """Compute a fix at most once per key across concurrent requests.
+
+    Returns (fix_dict_or_None, computed) - computed is False for
+    followers that coalesced onto another request's result.
+    """
+    with _inflight_lock:
+        fut = _inflight.get(cache_key)
+        if fut is None:
+            fut = Future()
+            _inflight[cache_key] = fut
+            leader = True
+        else:
+            leader = False
+
+    if not leader:
+        return fut.result(), False
+
+    try:
+        result = _compute_fix(code, filename)
+        fut.set_result(result)
+        return result, True
+    except BaseException as e:
+        fut.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(cache_key, None)
+
+
+# Cache/LLM statistics - the signals needed to tune cache size, TTL and
+# the semantic threshold. Exposed at /metrics in Prometheus text format.
+_stats = {
+    'cache_hits': 0,
+    'cache_misses': 0,
+    'llm_calls': 0,
+    'llm_seconds': 0.0,
+}
+_stats_lock = threading.Lock()
+
+
+def _record_stat(name, value=1):
+    """Thread-safe increment of a statistics counter"""
+    with _stats_lock:
+        _stats[name] += value
+
+
+# Canned fixes for the most common Python errors, loaded from
+# seed_fixes.json by a background thread at startup. Keyed by code hash
+# only (seeds are model-independent), so cold starts still get instant
+# answers for textbook errors.
+_seed_cache = {}
+
+
+def _fix_cache_get(key):
+    """Look up a cached fix dict in L1, then L2, then the seed fixes"""
+    cached = _fix_cache.get(key)
+    if cached is not None:
+        _fix_cache.move_to_end(key)
+        return cached
+
+    if _redis is not None:
+        try:
+            data = _redis.get(key)
+        except Exception:
+            data = None
+        if data is not None:
+            cached = _loads_fix(data)
+            _l1_put(key, cached)
+            return cached
+
+    # Keys look like 'fix:<code hash>:<model>'; seeds ignore the model
+    return _seed_cache.get(key.split(':')[1])
+
+
+def _l1_put(key, fix_dict):
+    """Store a fix dict in L1, evicting the least recently used if full"""
+    _fix_cache[key] = fix_dict
+    _fix_cache.move_to_end(key)
+    while len(_fix_cache) > _FIX_CACHE_MAX:
+        _fix_cache.popitem(last=False)
+
+
+def _fix_cache_put(key, fix_dict):
+    """Store a fix dict in both cache tiers"""
+    _l1_put(key, fix_dict)
+    if _redis is not None:
+        try:
+            _redis.setex(key, _FIX_CACHE_TTL, _dumps_fix(fix_dict))
+        except Exception:
+            pass
+
+
+# Semantic fix cache: catches submissions that differ only in whitespace,
+# naming or trivial edits but produce the same error/fix. An ANN lookup is
+# ~5-10 ms vs seconds for an LLM round-trip.
+_SEMANTIC_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92'))
+_EMBEDDING_DIM = 384  # all-MiniLM-L6-v2 output dimension
+
+_embed_model = None
+_faiss_index = None
+_semantic_fixes = []  # FAISS row id -> fix dict
+# Guards the index, the row-id list and lazy init: FAISS add() isn't safe
+# concurrent with search(), and an add that interleaves with the list
+# extend would misalign row ids with fixes for good
+_semantic_lock = threading.Lock()
+
+
+def _semantic_cache_ready():
+    """Lazily initialize the embedding model and FAISS index"""
+    global _embed_model, _faiss_index
+    if not SEMANTIC_CACHE_AVAILABLE:
+        return False
+    if _embed_model is None:
+        with _semantic_lock:
+            if _embed_model is None:
+                _faiss_index = faiss.IndexFlatIP(_EMBEDDING_DIM)
+                # Assigned last: other threads treat a set model as
+                # "fully initialized"
+                _embed_model = SentenceTransformer('all-MiniLM-L6-v2')
+    return True
+
+
+def _embed_code(code):
+    """Embed code as a unit-normalized vector (cosine == inner product)"""
+    return _embed_model.encode(
+        [_normalize_code(code)], normalize_embeddings=True, convert_to_numpy=True
+    )
+
+
+def _semantic_cache_get(code):
+    """Return a cached fix for semantically-equivalent code, or None"""
+    if not _semantic_cache_ready():
+        return None
+    vec = _embed_code(code)
+    with _semantic_lock:
+        if _faiss_index.ntotal == 0:
+            return None
+        scores, ids = _faiss_index.search(vec, 1)
+        if ids[0][0] >= 0 and scores[0][0] >= _SEMANTIC_THRESHOLD:
+            return _semantic_fixes[ids[0][0]]
+    return None
+
+
+def _semantic_cache_put(code, fix_dict):
+    """Index a new fix under the submission and its fixed file variants.
+
+    Everything is embedded in one batched encode() call - a single
+    forward pass instead of one per file - and added to FAISS in one
+    add() call. Indexing the fixed files too means a user who pastes
+    an already-patched variant still gets a cache hit.
+    """
+    if not _semantic_cache_ready():
+        return
+    codes = [_normalize_code(code)]
+    for fixed_content in fix_dict['file_changes'].values():
+        if fixed_content.strip():
+            codes.append(_normalize_code(fixed_content))
+    codes = list(dict.fromkeys(codes))
+    vecs = _embed_model.encode(
+        codes, batch_size=32, normalize_embeddings=True, convert_to_numpy=True
+    )
+    # add() and the row-id list must move in lockstep, and FAISS doesn't
+    # allow add() concurrent with search()
+    with _semantic_lock:
+        _faiss_index.add(vecs)
+        _semantic_fixes.extend([fix_dict] * len(codes))
+
+
+# The index page has zero dynamic content, so skip Jinja entirely: read
+# the rendered file once, compress it at maximum quality a single time,
+# and serve the cached bytes with ETag revalidation.
+_index_cache = None  # (body, etag, gzipped, brotlied)
+
+
+def _load_index():
+    """Read (and if needed create) the index page once, caching the raw
+    bytes plus max-quality gzip/brotli variants"""
+    global _index_cache
+    if _index_cache is None:
+        template_file = Path('templates') / 'index.html'
+        if not template_file.exists():
+            create_template()
+        body = template_file.read_bytes()
+        etag = hashlib.md5(body).hexdigest()
+        gzipped = gzip.compress(body, 9)
+        brotlied = brotli.compress(body, quality=11) if brotli is not None else None
+        _index_cache = (body, etag, gzipped, brotlied)
+    return _index_cache
 
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    body, etag, gzipped, brotlied = _load_index()
+    if request.headers.get('If-None-Match') == etag:
+        return '', 304, {'ETag': etag, 'Cache-Control': 'public, max-age=3600',
+                         'Vary': 'Accept-Encoding'}
+
+    # Content-negotiate the precompressed variants
+    accept_encoding = request.headers.get('Accept-Encoding', '')
+    encoding = None
+    if brotlied is not None and 'br' in accept_encoding:
+        body, encoding = brotlied, 'br'
+    elif 'gzip' in accept_encoding:
+        body, encoding = gzipped, 'gzip'
+
+    resp = make_response(body)
+    resp.headers['Content-Type'] = 'text/html; charset=utf-8'
+    resp.headers['Cache-Control'] = 'public, max-age=3600'
+    resp.headers['ETag'] = etag
+    resp.headers['Vary'] = 'Accept-Encoding'
+    if encoding:
+        resp.headers['Content-Encoding'] = encoding
+    return resp
 
 
 @app.route('/api/set-api-key', methods=['POST'])
 def set_api_key():
     global debugger
     try:
-        data = request.get_json()
+        data = _request_json()
         api_key = data.get('api_key')
         model = data.get('model', 'deepseek/deepseek-chat-v3-0324:free')
         
@@ -38,8 +698,7 @@ def set_api_key():
         # Initialize debugger
         debugger = AutoDebugger(api_key)
         debugger.analyzer.model = model
-        
-        session['api_key_set'] = True
+
         return jsonify({'success': True})
     
     except Exception as e:
@@ -54,50 +713,64 @@ def debug_code():
         return jsonify({'success': False, 'error': 'API key not set'})
     
     try:
-        data = request.get_json()
+        data = _request_json()
         code = data.get('code', '')
         filename = data.get('filename', 'temp_script.py')
         
         if not code.strip():
             return jsonify({'success': False, 'error': 'No code provided'})
-        
-        # Create temporary file
-        temp_dir = Path(tempfile.gettempdir()) / 'auto_debugger'
-        temp_dir.mkdir(exist_ok=True)
-        
-        temp_file = temp_dir / f"{uuid.uuid4().hex}_{filename}"
-        temp_file.write_text(code, encoding='utf-8')
-        
-        try:
-            # Run auto-fix
-            fix_suggestion = debugger.auto_fix_code(str(temp_file))
-            
-            if fix_suggestion is None:
+
+        cache_key = _fix_cache_key(code, debugger.analyzer.model)
+        if ENABLE_FIX_CACHE:
+            # Serve repeat submissions straight from the cache (no LLM call)
+            cached_fix = _fix_cache_get(cache_key)
+            if cached_fix is not None:
+                _record_stat('cache_hits')
                 return jsonify({
                     'success': True,
-                    'no_errors': True,
-                    'message': 'Code executed successfully - no errors found!'
+                    'no_errors': False,
+                    'cache_hit': True,
+                    'fix': cached_fix
                 })
-            
-            # Return fix suggestion
+
+            # Exact miss - try the semantic cache for near-duplicate code
+            cached_fix = _semantic_cache_get(code)
+            if cached_fix is not None:
+                _record_stat('cache_hits')
+                _fix_cache_put(cache_key, cached_fix)
+                return jsonify({
+                    'success': True,
+                    'no_errors': False,
+                    'cache_hit': True,
+                    'semantic_hit': True,
+                    'fix': cached_fix
+                })
+
+        # Cache miss: compute at most once even if identical submissions
+        # race in from several tabs
+        fix_dict, computed = _single_flight_fix(cache_key, code, filename)
+
+        if fix_dict is None:
             return jsonify({
                 'success': True,
-                'no_errors': False,
-                'fix': {
-                    'analysis': fix_suggestion.analysis,
-                    'root_cause': fix_suggestion.root_cause,
-                    'fix_description': fix_suggestion.fix_description,
-                    'confidence': fix_suggestion.confidence,
-                    'replication_steps': fix_suggestion.replication_steps,
-                    'file_changes': fix_suggestion.file_changes
-                }
+                'no_errors': True,
+                'message': 'Code executed successfully - no errors found!'
             })
-        
-        finally:
-            # Clean up temp file
-            if temp_file.exists():
-                temp_file.unlink()
-    
+
+        # Cache and return fix suggestion (followers piggyback on the
+        # leader's result, which also does the caching). Failed LLM calls
+        # are returned but never cached.
+        if computed and ENABLE_FIX_CACHE and not _is_llm_failure(fix_dict):
+            _fix_cache_put(cache_key, fix_dict)
+            _semantic_cache_put(code, fix_dict)
+
+        return jsonify({
+            'success': True,
+            'no_errors': False,
+            'cache_hit': not computed,
+            'fix': fix_dict
+        })
+
     except Exception as e:
         return jsonify({
             'success': False, 
@@ -113,7 +786,7 @@ def apply_fix():
         return jsonify({'success': False, 'error': 'API key not set'})
     
     try:
-        data = request.get_json()
+        data = _request_json()
         original_code = data.get('original_code', '')
         fixed_code = data.get('fixed_code', '')
         filename = data.get('filename', 'fixed_script.py')
@@ -137,48 +810,48 @@ def apply_fix():
 @app.route('/api/run-code', methods=['POST'])
 def run_code():
     try:
-        data = request.get_json()
+        data = _request_json()
         code = data.get('code', '')
         filename = data.get('filename', 'temp_script.py')
         if not code.strip():
             return jsonify({'success': False, 'error': 'No code provided'})
-        temp_dir = Path(tempfile.gettempdir()) / 'auto_debugger'
-        temp_dir.mkdir(exist_ok=True)
-        temp_file = temp_dir / f"{uuid.uuid4().hex}_{filename}"
-        temp_file.write_text(code, encoding='utf-8')
-        import subprocess
-        import re
-        try:
-            result = subprocess.run(
-                ['python', str(temp_file)],
-                capture_output=True, text=True, timeout=10
-            )
-            output = result.stdout
-            error = result.stderr
-            error_file = None
-            error_line = None
-            # Parse stacktrace for file and line
-            if error:
-                # Look for the last 'File ...' line
-                matches = list(re.finditer(r'File "([^"]+)", line (\d+)', error))
-                if matches:
-                    last = matches[-1]
-                    error_file = last.group(1)
-                    error_line = int(last.group(2))
-            return jsonify({
-                'success': True,
-                'output': output,
-                'error': error,
-                'error_file': error_file,
-                'error_line': error_line
-            })
-        finally:
-            if temp_file.exists():
-                temp_file.unlink()
+
+        # Stream output incrementally as newline-delimited JSON instead of
+        # buffering the whole run and replying once at the end
+        def generate():
+            for event in _stream_run_events(code, filename):
+                yield json.dumps(event) + '\n'
+
+        return Response(stream_with_context(generate()),
+                        mimetype='application/x-ndjson')
     except Exception as e:
         return jsonify({'success': False, 'error': f'Error running code: {str(e)}'})
 
 
+@app.route('/metrics')
+def metrics():
+    """Cache/LLM statistics in Prometheus text exposition format"""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    lines = [
+        '# TYPE fix_cache_hits_total counter',
+        f"fix_cache_hits_total {snapshot['cache_hits']}",
+        '# TYPE fix_cache_misses_total counter',
+        f"fix_cache_misses_total {snapshot['cache_misses']}",
+        '# TYPE fix_llm_calls_total counter',
+        f"fix_llm_calls_total {snapshot['llm_calls']}",
+        '# TYPE fix_llm_seconds_total counter',
+        f"fix_llm_seconds_total {snapshot['llm_seconds']:.6f}",
+        '# TYPE fix_cache_l1_entries gauge',
+        f'fix_cache_l1_entries {len(_fix_cache)}',
+        '# TYPE fix_cache_seed_entries gauge',
+        f'fix_cache_seed_entries {len(_seed_cache)}',
+        '# TYPE fix_cache_semantic_entries gauge',
+        f'fix_cache_semantic_entries {len(_semantic_fixes)}',
+    ]
+    return '\n'.join(lines) + '\n', 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+
 # Create templates directory and HTML template
 def create_template():
     templates_dir = Path('templates')
@@ -534,17 +1207,46 @@ print(f"Average: {result}")
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ code: code, filename: filename })
                 });
-                const data = await response.json();
-                if (data.success) {
-                    let output = data.output ? `<pre>${escapeHtml(data.output)}</pre>` : '';
-                    let error = data.error ? `<pre style="color:#b00;">${escapeHtml(data.error)}</pre>` : '';
-                    let errorLoc = '';
-                    if (data.error_file && data.error_line) {
-                        errorLoc = `<div style="color:#ff8c00; font-weight:bold;">Error in <span style="text-decoration:underline;">${escapeHtml(data.error_file)}</span> at line <span style="text-decoration:underline;">${data.error_line}</span></div>`;
+                if (!response.ok || !response.body) {
+                    showRunError('Server error: ' + response.status);
+                    return;
+                }
+                // The server streams NDJSON events; render output lines
+                // as they arrive instead of waiting for the run to finish
+                runResults.innerHTML = '<h3>▶️ Code Output</h3><pre id="liveStdout"></pre><pre id="liveStderr" style="color:#b00;"></pre>';
+                const stdoutEl = document.getElementById('liveStdout');
+                const stderrEl = document.getElementById('liveStderr');
+                let doneEvent = null;
+                const handleLine = (line) => {
+                    if (!line.trim()) return;
+                    const event = JSON.parse(line);
+                    if (event.error) {
+                        showRunError('Error: ' + event.error);
+                    } else if (event.done) {
+                        doneEvent = event;
+                    } else if (event.stream === 'stdout') {
+                        stdoutEl.textContent += event.data;
+                    } else if (event.stream === 'stderr') {
+                        stderrEl.textContent += event.data;
                     }
-                    runResults.innerHTML = `<h3>▶️ Code Output</h3>${output}${errorLoc}${error}`;
-                } else {
-                    showRunError('Error: ' + data.error);
+                };
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+                while (true) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+                    buffer += decoder.decode(value, { stream: true });
+                    const lines = buffer.split('\\n');
+                    buffer = lines.pop();
+                    lines.forEach(handleLine);
+                }
+                if (buffer.trim()) handleLine(buffer);
+                if (doneEvent && doneEvent.error_file && doneEvent.error_line) {
+                    const loc = document.createElement('div');
+                    loc.style.cssText = 'color:#ff8c00; font-weight:bold;';
+                    loc.textContent = `Error in ${doneEvent.error_file} at line ${doneEvent.error_line}`;
+                    runResults.insertBefore(loc, stderrEl);
                 }
             } catch (error) {
                 showRunError('Network error: ' + error.message);
@@ -677,6 +1379,32 @@ print(f"Average: {result}")
     print(f"Created template: {template_file}")
 
 
+def _warm_seed_cache():
+    """Preload canned fixes for common error patterns into the caches.
+
+    Runs in a background thread so startup isn't delayed (the semantic
+    side loads the embedding model on first use). After warming, textbook
+    errors hit the cache in microseconds instead of paying an LLM call.
+    """
+    seed_file = Path(__file__).parent / 'seed_fixes.json'
+    try:
+        seeds = json.loads(seed_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        print(f"Warning: could not load seed fixes: {e}")
+        return
+    for entry in seeds:
+        code = entry['code']
+        fix = entry['fix']
+        normalized = _normalize_code(code)
+        code_hash = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        _seed_cache[code_hash] = fix
+        _semantic_cache_put(code, fix)
+
+
+if os.getenv('SEED_CACHE', '1') == '1':
+    threading.Thread(target=_warm_seed_cache, daemon=True).start()
+
+
 if __name__ == '__main__':
     # Always (re)create the template on startup
     create_template()
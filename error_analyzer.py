@@ -1,14 +1,46 @@
 import ast
+import asyncio
+import functools
+import hashlib
+import shutil
+import threading
+import time
 import traceback
 import sys
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 import re
 
+# Optional async HTTP client - enables overlapping several LLM calls
+# instead of serializing their network round-trips
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Optional fast JSON parser - LLM replies can be 4000-token blobs whose
+# string fields hold entire files, where orjson's parse speed shows
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(text: str):
+    """Parse a JSON string, preferring orjson when installed"""
+    if orjson is not None:
+        # orjson wants bytes; the encode is cheap next to the parse
+        return orjson.loads(text.encode('utf-8'))
+    return json.loads(text)
+
 
 @dataclass
 class ErrorInfo:
@@ -35,6 +67,24 @@ class FixSuggestion:
     file_changes: Dict[str, str]  # file_path -> new_content
 
 
+@functools.lru_cache(maxsize=128)
+def _read_file_cached(path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """Read a file's lines, cached per (path, mtime, size).
+
+    Deep or recursive tracebacks reference the same file once per frame;
+    with mtime and size in the key, repeat reads become dict lookups and
+    the cache self-invalidates when the file changes.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return tuple(f.read().splitlines())
+
+
+def _read_source_lines(path: str) -> Tuple[str, ...]:
+    """Stat-then-read a source file through the content cache"""
+    st = os.stat(path)
+    return _read_file_cached(path, st.st_mtime_ns, st.st_size)
+
+
 class CodeContextExtractor:
     """Extracts relevant code context from error traces"""
     
@@ -54,38 +104,77 @@ class CodeContextExtractor:
             context[error_info.file_path] = main_context
         
         # Extract from related files in stack trace
-        for file_path in error_info.relevant_files:
-            if file_path != error_info.file_path and os.path.exists(file_path):
+        related = [
+            file_path for file_path in error_info.relevant_files
+            if file_path != error_info.file_path and os.path.exists(file_path)
+        ]
+        if len(related) <= 1:
+            for file_path in related:
                 file_context = self._get_full_file_content(file_path)
                 if file_context:
                     context[file_path] = file_context
-        
+        else:
+            # Group directory-local files so metadata lookups and reads
+            # stay clustered; dict insertion order still follows the sort
+            related.sort(key=os.path.dirname)
+            # Reads are IO-bound (the GIL is released in read()), so a
+            # deep traceback's files load in parallel on a cold cache
+            with ThreadPoolExecutor(max_workers=min(8, len(related))) as pool:
+                contents = pool.map(self._get_full_file_content, related)
+                for file_path, file_context in zip(related, contents):
+                    if file_context:
+                        context[file_path] = file_context
+
         return context
     
     def _get_file_context(self, file_path: str, line_number: int) -> Optional[str]:
         """Get context around specific line"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
+            # Cached single read - repeated frames in one traceback (or
+            # repeated errors in one session) don't re-open the file
+            lines = _read_source_lines(file_path)
+
             start = max(0, line_number - self.context_lines - 1)
             end = min(len(lines), line_number + self.context_lines)
-            
+
             context_lines = []
             for i in range(start, end):
                 marker = ">>> " if i == line_number - 1 else "    "
                 context_lines.append(f"{marker}{i+1:4d}: {lines[i].rstrip()}")
-            
+
             return "\n".join(context_lines)
         except Exception as e:
             return f"Error reading file: {e}"
     
+    # Stat-only rejection threshold: 100 lines at a very generous 1 KiB
+    # per line. Ordinary <=100-line sources stay well under this, so the
+    # exact line-count check below still decides them; only clearly
+    # oversized files (stray logs, data dumps) skip the read.
+    max_content_bytes = 100 * 1024
+
     def _get_full_file_content(self, file_path: str) -> Optional[str]:
         """Get full file content for smaller files"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                # Cheap fstat first - a stray multi-megabyte file in the
+                # traceback should not get read just to be discarded
+                st = os.fstat(fd)
+                if st.st_size > self.max_content_bytes:
+                    return f"File too large ({st.st_size} bytes), skipping full content"
+
+                # Tell the kernel we are about to read this front-to-back
+                # so it can prefetch instead of waiting on demand faults
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(
+                        fd, 0, 0,
+                        os.POSIX_FADV_SEQUENTIAL | os.POSIX_FADV_WILLNEED
+                    )
+                with os.fdopen(os.dup(fd), 'r', encoding='utf-8') as f:
+                    content = f.read()
+            finally:
+                os.close(fd)
+
             # Only include full content for smaller files
             line_count = len(content.splitlines())
             if line_count <= 100:
@@ -96,14 +185,94 @@ class CodeContextExtractor:
             return f"Error reading file: {e}"
 
 
+# Frame-header pattern for formatted tracebacks, compiled once at import
+# so callers never pay regex-compilation cost per trace.
+_TB_FRAME_RE = re.compile(
+    r'^\s*File "(?P<f>[^"]+)", line (?P<n>\d+), in (?P<fn>\S+)',
+    re.MULTILINE
+)
+
+
+def parse_format_exception(text: str) -> List[Tuple[str, int, str]]:
+    """Extract (file, line, function) frames from a formatted traceback.
+
+    Scans traceback.format_exception output (e.g. the stack_trace string
+    we embed in prompts) with one compiled-regex pass instead of a
+    per-line Python loop.
+    """
+    return [
+        (m.group('f'), int(m.group('n')), m.group('fn'))
+        for m in _TB_FRAME_RE.finditer(text)
+    ]
+
+
+# Standard bridge sentences between chained exceptions, matching what
+# traceback.format_exception emits for raise-from and implicit context
+_CAUSE_MESSAGE = ('\nThe above exception was the direct cause '
+                  'of the following exception:\n\n')
+_CONTEXT_MESSAGE = ('\nDuring handling of the above exception, '
+                    'another exception occurred:\n\n')
+
+
+def _format_exception_headers(exc_type, exc_value, exc_traceback) -> str:
+    """Format an exception and its cause/context chain, headers only.
+
+    Mirrors traceback.format_exception's chained output but skips source
+    line lookup - the context lines it would re-read from disk already
+    ship separately as CODE CONTEXT. Chained exceptions (raise X from Y
+    and implicit context) are walked innermost-first so the root cause
+    stays in the trace.
+    """
+    # Walk outward-in, recording the bridge sentence that links each
+    # inner exception to the one it caused
+    chain = [(exc_type, exc_value, exc_traceback, None)]
+    seen = {id(exc_value)}
+    while exc_value is not None:
+        if exc_value.__cause__ is not None:
+            inner, bridge = exc_value.__cause__, _CAUSE_MESSAGE
+        elif (exc_value.__context__ is not None
+                and not exc_value.__suppress_context__):
+            inner, bridge = exc_value.__context__, _CONTEXT_MESSAGE
+        else:
+            break
+        if id(inner) in seen:  # guard against exception cycles
+            break
+        seen.add(id(inner))
+        chain.append((type(inner), inner, inner.__traceback__, bridge))
+        exc_value = inner
+
+    parts = []
+    for etype, value, tb, bridge in reversed(chain):
+        if tb is not None:
+            summary = traceback.StackSummary.extract(
+                traceback.walk_tb(tb), lookup_lines=False
+            )
+            parts.append('Traceback (most recent call last):\n')
+            parts.extend(
+                f'  File "{frame.filename}", line {frame.lineno}, in {frame.name}\n'
+                for frame in summary
+            )
+        parts.extend(traceback.format_exception_only(etype, value))
+        if bridge is not None:
+            parts.append(bridge)
+    return ''.join(parts)
+
+
 class StackTraceParser:
     """Parses Python stack traces to extract relevant information"""
-    
+
+    def __init__(self, extractor: Optional[CodeContextExtractor] = None):
+        # Shared with the caller where possible so both sides hit the
+        # same context cache instead of each warming their own
+        self.extractor = extractor if extractor is not None else CodeContextExtractor()
+
     def parse_error(self, exc_type, exc_value, exc_traceback) -> ErrorInfo:
         """Parse exception information into ErrorInfo object"""
-        # Get stack trace as string
-        stack_trace = ''.join(traceback.format_exception(exc_type, exc_value, exc_traceback))
-        
+        # format_exception re-opens every source file in the traceback to
+        # render context lines we already ship separately as CODE CONTEXT.
+        # Format headers only instead - no second read of any file.
+        stack_trace = _format_exception_headers(exc_type, exc_value, exc_traceback)
+
         # Get the last frame (where error occurred)
         tb = exc_traceback
         while tb.tb_next:
@@ -118,8 +287,7 @@ class StackTraceParser:
         relevant_files = self._extract_files_from_traceback(exc_traceback)
         
         # Get surrounding code
-        extractor = CodeContextExtractor()
-        surrounding_code = extractor._get_file_context(file_path, line_number) or ""
+        surrounding_code = self.extractor._get_file_context(file_path, line_number) or ""
         
         return ErrorInfo(
             error_type=exc_type.__name__,
@@ -133,121 +301,484 @@ class StackTraceParser:
         )
     
     def _extract_files_from_traceback(self, tb) -> List[str]:
-        """Extract all file paths from traceback"""
+        """Extract unique file paths from traceback, in frame order"""
         files = []
+        seen = set()
         while tb:
             file_path = tb.tb_frame.f_code.co_filename
-            if file_path.endswith('.py') and not file_path.startswith('<'):
+            if (file_path.endswith('.py') and not file_path.startswith('<')
+                    and file_path not in seen):
+                seen.add(file_path)
                 files.append(file_path)
             tb = tb.tb_next
-        return list(set(files))  # Remove duplicates
+        return files
+
+
+# Static prompt prefix, byte-identical across every call. Provider-side
+# prefix caching (Anthropic, DeepSeek, OpenAI via OpenRouter) only fires
+# when the leading tokens match exactly, so all instructions and the
+# response schema live here and the per-error details go in the user
+# message. Nothing dynamic (timestamps, paths) may appear in this block.
+SYSTEM_PROMPT = """\
+You are an expert Python debugger. Analyze the error the user reports and provide a complete fix.
+
+Please provide your response in the following JSON format:
+{
+    "analysis": "Detailed analysis of what went wrong",
+    "root_cause": "The fundamental cause of the error",
+    "fix_description": "Clear description of the fix",
+    "confidence": 0.85,
+    "replication_steps": [
+        "Step 1 to reproduce the error",
+        "Step 2...",
+        "..."
+    ],
+    "file_changes": {
+        "/path/to/file.py": "complete fixed file content here"
+    }
+}
+
+Focus on:
+1. Understanding the root cause
+2. Providing a working fix
+3. Explaining why the fix works
+4. Being specific about file changes needed
+
+Ensure the fixed code is complete and syntactically correct.
+"""
+
+# Instructions prepended to multi-error reports. Static so it sits right
+# after the (cached) system prompt in the token stream.
+BATCH_PROMPT_HEADER = """\
+This report contains MULTIPLE independent errors, each labeled with a
+numeric id. Analyze every one of them.
+
+Instead of the single-error format, respond with JSON of the form:
+{
+    "fixes": [
+        {
+            "id": 0,
+            "analysis": "...",
+            "root_cause": "...",
+            "fix_description": "...",
+            "confidence": 0.85,
+            "replication_steps": ["..."],
+            "file_changes": {"/path/to/file.py": "complete fixed file content"}
+        }
+    ]
+}
+with exactly one entry per reported error id.
+"""
+
+# Models whose OpenRouter passthrough honors explicit cache_control markers
+_CACHE_CONTROL_MODEL_PREFIXES = ('anthropic/', 'deepseek/')
+
+# Per-error prompt skeleton, built once at import instead of re-assembled
+# inside every _create_analysis_prompt call.
+_ANALYSIS_PROMPT_TEMPLATE = """
+ERROR INFORMATION:
+- Type: {error_type}
+- Message: {error_message}
+- File: {file_path}
+- Line: {line_number}
+- Function: {function_name}
+
+STACK TRACE:
+{stack_trace}
+
+CODE CONTEXT:
+{context}
+"""
+
+
+def _find_first_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} block in text, or None.
+
+    Single O(n) pass tracking brace depth and string/escape state. The
+    greedy regex this replaces could backtrack across a 4000-token reply
+    and happily glued the first '{' to the last '}' even when they came
+    from unrelated code fences.
+    """
+    start = -1
+    depth = 0
+    in_string = False
+    escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            if depth:
+                in_string = True
+        elif ch == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
 
 
 class LLMAnalyzer:
     """Handles LLM communication for error analysis and fix generation"""
-    
-    def __init__(self, api_key: str, model: str = "anthropic/claude-3.5-sonnet"):
+
+    # One pooled session shared by every analyzer instance: reusing the
+    # TCP+TLS connection saves ~150-300 ms of handshake per call after
+    # the first. Retries are handled explicitly in _call_llm.
+    _session = None
+    _session_lock = threading.Lock()
+
+    def __init__(self, api_key: str, model: str = "anthropic/claude-3.5-sonnet",
+                 request_timeout: Tuple[float, float] = (5, 30),
+                 max_retries: int = 3):
         self.api_key = api_key
         self.model = model
         self.base_url = "https://openrouter.ai/api/v1/chat/completions"
+        # (connect, read) - read sits just above typical response latency
+        # so a tail-latency call gets re-issued instead of blocking
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = 0.5
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Lazily create the shared keep-alive session"""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+                    session.mount('https://', adapter)
+                    cls._session = session
+        return cls._session
     
     def analyze_and_fix(self, error_info: ErrorInfo, code_context: Dict[str, str]) -> FixSuggestion:
         """Send error to LLM for analysis and fix generation"""
         prompt = self._create_analysis_prompt(error_info, code_context)
-        
+
         try:
             response = self._call_llm(prompt)
             return self._parse_llm_response(response, error_info)
         except Exception as e:
-            return FixSuggestion(
-                analysis=f"Error calling LLM: {e}",
-                root_cause="Unable to analyze",
-                fix_description="Manual investigation required",
-                modified_code="",
-                replication_steps=["Run the original code to reproduce"],
-                confidence=0.0,
-                file_changes={}
+            return self._llm_failure(e)
+
+    # Upper bound on errors combined into one prompt - beyond this the
+    # response tends to blow past max_tokens
+    max_batch = 10
+
+    def analyze_many(self, error_batches: List[Tuple[ErrorInfo, Dict[str, str]]]) -> List[FixSuggestion]:
+        """Analyze several errors, combining them into batched prompts.
+
+        Up to max_batch errors share a single LLM call (one network RTT
+        and one pass over the shared preamble instead of N). When more
+        than one batched call is needed and aiohttp is installed, the
+        calls overlap concurrently.
+        """
+        groups = [error_batches[i:i + self.max_batch]
+                  for i in range(0, len(error_batches), self.max_batch)]
+        if aiohttp is None or len(groups) <= 1:
+            results = []
+            for group in groups:
+                results.extend(self._analyze_batch(group))
+            return results
+        return asyncio.run(self._analyze_groups_async(groups))
+
+    async def _analyze_groups_async(self, groups):
+        """Gather concurrent batched calls over a shared keep-alive session"""
+        connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=180, connect=10)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            group_results = await asyncio.gather(
+                *[self._analyze_batch_async(session, group) for group in groups]
             )
+        return [fix for result in group_results for fix in result]
+
+    def _analyze_batch(self, group) -> List[FixSuggestion]:
+        """Analyze one group of errors with a single LLM call"""
+        if len(group) == 1:
+            error_info, code_context = group[0]
+            return [self.analyze_and_fix(error_info, code_context)]
+        prompt = self._create_batch_prompt(group)
+        try:
+            response = self._call_llm(prompt)
+            return self._parse_batch_response(response, group)
+        except Exception as e:
+            return [self._llm_failure(e) for _ in group]
+
+    async def _analyze_batch_async(self, session, group) -> List[FixSuggestion]:
+        """Async counterpart of _analyze_batch"""
+        if len(group) == 1:
+            error_info, code_context = group[0]
+            prompt = self._create_analysis_prompt(error_info, code_context)
+            try:
+                response = await self._call_llm_async(session, prompt)
+                return [self._parse_llm_response(response, error_info)]
+            except Exception as e:
+                return [self._llm_failure(e)]
+        prompt = self._create_batch_prompt(group)
+        try:
+            response = await self._call_llm_async(session, prompt)
+            return self._parse_batch_response(response, group)
+        except Exception as e:
+            return [self._llm_failure(e) for _ in group]
+
+    def _llm_failure(self, e: Exception) -> FixSuggestion:
+        """Fallback suggestion when the LLM call itself fails"""
+        return FixSuggestion(
+            analysis=f"Error calling LLM: {e}",
+            root_cause="Unable to analyze",
+            fix_description="Manual investigation required",
+            modified_code="",
+            replication_steps=["Run the original code to reproduce"],
+            confidence=0.0,
+            file_changes={}
+        )
     
     def _create_analysis_prompt(self, error_info: ErrorInfo, code_context: Dict[str, str]) -> str:
-        """Create detailed prompt for LLM analysis"""
-        context_str = ""
-        for file_path, content in code_context.items():
-            context_str += f"\n\n=== FILE: {file_path} ===\n{content}"
-        
-        prompt = f"""
-You are an expert Python debugger. Analyze this error and provide a complete fix.
+        """Create the dynamic (per-error) part of the prompt.
 
-ERROR INFORMATION:
-- Type: {error_info.error_type}
-- Message: {error_info.error_message}
-- File: {error_info.file_path}
-- Line: {error_info.line_number}
-- Function: {error_info.function_name}
+        The instructions and response schema live in SYSTEM_PROMPT so the
+        provider can cache that prefix; only the error details vary here.
+        """
+        context_str = "".join(
+            f"\n\n=== FILE: {file_path} ===\n{content}"
+            for file_path, content in code_context.items()
+        )
 
-STACK TRACE:
-{error_info.stack_trace}
+        return _ANALYSIS_PROMPT_TEMPLATE.format_map({
+            "error_type": error_info.error_type,
+            "error_message": error_info.error_message,
+            "file_path": error_info.file_path,
+            "line_number": error_info.line_number,
+            "function_name": error_info.function_name,
+            "stack_trace": error_info.stack_trace,
+            "context": context_str
+        })
 
-CODE CONTEXT:
-{context_str}
+    def _create_batch_prompt(self, error_batches) -> str:
+        """Create one prompt covering several independent errors.
 
-Please provide your response in the following JSON format:
-{{
-    "analysis": "Detailed analysis of what went wrong",
-    "root_cause": "The fundamental cause of the error",
-    "fix_description": "Clear description of the fix",
-    "confidence": 0.85,
-    "replication_steps": [
-        "Step 1 to reproduce the error",
-        "Step 2...",
-        "..."
-    ],
-    "file_changes": {{
-        "/path/to/file.py": "complete fixed file content here"
-    }}
-}}
+        Each error gets a numeric id that the model must echo back in
+        its fixes array, so results can be mapped to their errors.
+        """
+        sections = [BATCH_PROMPT_HEADER]
+        for error_id, (error_info, code_context) in enumerate(error_batches):
+            sections.append(f"\n===== ERROR {error_id} =====")
+            sections.append(self._create_analysis_prompt(error_info, code_context))
+        return "\n".join(sections)
 
-Focus on:
-1. Understanding the root cause
-2. Providing a working fix
-3. Explaining why the fix works
-4. Being specific about file changes needed
+    def _parse_batch_response(self, response: str, error_batches) -> List[FixSuggestion]:
+        """Parse a fixes-array response back into per-error FixSuggestions"""
+        fixes_by_id = {}
+        try:
+            json_str = _find_first_json_object(response)
+            if json_str:
+                data = _json_loads(json_str)
+                for entry in data.get("fixes", []):
+                    try:
+                        # Models routinely emit "id": "0" despite the
+                        # schema; coerce so the int lookup below matches
+                        entry_id = int(entry.get("id"))
+                    except (TypeError, ValueError):
+                        continue
+                    fixes_by_id[entry_id] = FixSuggestion(
+                        analysis=entry.get("analysis", "No analysis provided"),
+                        root_cause=entry.get("root_cause", "Unknown"),
+                        fix_description=entry.get("fix_description", "No fix description"),
+                        modified_code="",
+                        replication_steps=entry.get("replication_steps", []),
+                        confidence=float(entry.get("confidence", 0.5)),
+                        file_changes=entry.get("file_changes", {})
+                    )
+        except Exception as e:
+            return [self._llm_failure(e) for _ in error_batches]
 
-Ensure the fixed code is complete and syntactically correct.
-"""
-        return prompt
+        missing = FixSuggestion(
+            analysis="No fix returned for this error in the batched response",
+            root_cause="Unknown",
+            fix_description="Re-run this error individually",
+            modified_code="",
+            replication_steps=[],
+            confidence=0.0,
+            file_changes={}
+        )
+        return [fixes_by_id.get(i, missing) for i in range(len(error_batches))]
     
-    def _call_llm(self, prompt: str) -> str:
-        """Make API call to OpenRouter"""
-        headers = {
+    def _prewarm(self):
+        """Open a TLS connection to OpenRouter before the first real call.
+
+        The first analyze otherwise pays ~150-300 ms of TCP+TLS handshake
+        on top of the LLM latency; a cheap HEAD from a daemon thread
+        leaves a warm keep-alive connection in the shared pool.
+        """
+        def warm():
+            try:
+                self._get_session().head(
+                    "https://openrouter.ai/api/v1/models", timeout=5
+                )
+            except requests.RequestException:
+                pass  # best effort - the real call will connect normally
+
+        threading.Thread(target=warm, daemon=True).start()
+
+    def _request_headers(self) -> Dict[str, str]:
+        """HTTP headers for OpenRouter calls"""
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
-        data = {
+
+    def _system_message(self) -> Dict:
+        """Static system message, marked cacheable where supported"""
+        if self.model.startswith(_CACHE_CONTROL_MODEL_PREFIXES):
+            return {
+                "role": "system",
+                "content": [{
+                    "type": "text",
+                    "text": SYSTEM_PROMPT,
+                    "cache_control": {"type": "ephemeral"}
+                }]
+            }
+        return {"role": "system", "content": SYSTEM_PROMPT}
+
+    def _request_payload(self, prompt: str, stream: bool = False) -> Dict:
+        """Request body for OpenRouter calls"""
+        payload = {
             "model": self.model,
             "messages": [
+                self._system_message(),
                 {"role": "user", "content": prompt}
             ],
             "temperature": 0.1,
             "max_tokens": 4000
         }
-        
-        response = requests.post(self.base_url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        result = response.json()
-        return result["choices"][0]["message"]["content"]
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    # Statuses worth retrying - transient server trouble or rate limiting
+    _RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def _call_llm(self, prompt: str) -> str:
+        """Make API call to OpenRouter with timeout and backoff retries.
+
+        Slow or failed attempts are re-issued with exponential backoff
+        (base 0.5 s) up to max_retries times; re-issuing a stalled call
+        usually beats waiting out its tail latency.
+        """
+        headers = self._request_headers()
+        payload = self._request_payload(prompt, stream=True)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.retry_base_delay * 2 ** (attempt - 1))
+            try:
+                response = self._get_session().post(
+                    self.base_url,
+                    headers=headers,
+                    json=payload,
+                    stream=True,
+                    timeout=self.request_timeout
+                )
+            except (requests.Timeout, requests.ConnectionError) as e:
+                last_error = e
+                continue
+            if response.status_code in self._RETRY_STATUSES:
+                response.close()
+                last_error = requests.HTTPError(
+                    f"HTTP {response.status_code} from OpenRouter",
+                    response=response
+                )
+                continue
+            response.raise_for_status()
+            try:
+                return self._consume_stream(response)
+            except (requests.Timeout, requests.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                last_error = e
+                continue
+        raise last_error
+
+    def _consume_stream(self, response) -> str:
+        """Accumulate streamed SSE deltas into the reply text.
+
+        With stream=True the first tokens arrive while the model is still
+        generating, so parsing overlaps generation. Once the brace scanner
+        sees a complete top-level JSON object we stop reading instead of
+        waiting out the remaining tokens.
+        """
+        parts = []
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                delta = self._stream_delta(line)
+                if delta is None:
+                    break
+                if not delta:
+                    continue
+                parts.append(delta)
+                # Only re-scan when a closing brace arrived; scanning the
+                # whole buffer on every token would be quadratic.
+                if '}' in delta and _find_first_json_object(''.join(parts)):
+                    break
+        finally:
+            response.close()
+        return ''.join(parts)
+
+    @staticmethod
+    def _stream_delta(line: str) -> Optional[str]:
+        """Extract the content delta from one SSE line.
+
+        Returns '' for lines with nothing to append (comments, keep-alives,
+        role/usage chunks) and None when the stream is finished.
+        """
+        if not line or not line.startswith("data:"):
+            return ''
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return None
+        try:
+            chunk = _json_loads(data)
+        except ValueError:
+            return ''
+        choices = chunk.get("choices")
+        if not choices:
+            return ''
+        return choices[0].get("delta", {}).get("content") or ''
+
+    async def _call_llm_async(self, session, prompt: str) -> str:
+        """Async API call to OpenRouter over a shared session"""
+        parts = []
+        async with session.post(
+            self.base_url,
+            headers=self._request_headers(),
+            json=self._request_payload(prompt, stream=True)
+        ) as response:
+            response.raise_for_status()
+            async for raw in response.content:
+                delta = self._stream_delta(raw.decode('utf-8', 'replace').strip())
+                if delta is None:
+                    break
+                if not delta:
+                    continue
+                parts.append(delta)
+                if '}' in delta and _find_first_json_object(''.join(parts)):
+                    break
+        return ''.join(parts)
     
     def _parse_llm_response(self, response: str, error_info: ErrorInfo) -> FixSuggestion:
         """Parse LLM response into FixSuggestion object"""
         try:
             # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                data = json.loads(json_str)
-                
+            json_str = _find_first_json_object(response)
+            if json_str:
+                data = _json_loads(json_str)
+
                 return FixSuggestion(
                     analysis=data.get("analysis", "No analysis provided"),
                     root_cause=data.get("root_cause", "Unknown"),
@@ -280,12 +811,80 @@ Ensure the fixed code is complete and syntactically correct.
             )
 
 
+class ErrorBatcher:
+    """Queues and deduplicates errors for batched LLM analysis.
+
+    A program raising in a tight loop (like buggy_recursion) can produce
+    thousands of near-identical exceptions; analyzing each one is pure
+    waste. Submitted errors are deduplicated by (error_type, file, line)
+    - identical errors share one Future - and pending errors are flushed
+    as a single batched LLM call once max_batch distinct errors are
+    queued or max_interval seconds have elapsed, whichever comes first.
+    """
+
+    def __init__(self, analyzer: 'LLMAnalyzer', max_batch: int = 10,
+                 max_interval: float = 5.0):
+        self.analyzer = analyzer
+        self.max_batch = max_batch
+        self.max_interval = max_interval
+        self._pending = {}  # dedup key -> (error_info, code_context, Future)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def submit(self, error_info: ErrorInfo, code_context: Dict[str, str]) -> Future:
+        """Queue an error for analysis, returning a Future for its fix"""
+        key = (error_info.error_type,
+               os.path.normpath(error_info.file_path),
+               error_info.line_number)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending[2]
+            future = Future()
+            self._pending[key] = (error_info, code_context, future)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.max_batch:
+                self._wakeup.set()
+        return future
+
+    def _flush_loop(self):
+        """Background thread: flush pending errors on size or interval"""
+        while True:
+            self._wakeup.wait(self.max_interval)
+            self._wakeup.clear()
+            with self._lock:
+                batch = list(self._pending.values())
+                self._pending.clear()
+                if not batch:
+                    # Idle - exit and let the next submit() restart us
+                    self._thread = None
+                    return
+            try:
+                fixes = self.analyzer.analyze_many(
+                    [(info, ctx) for info, ctx, _ in batch]
+                )
+                for (_, _, future), fix in zip(batch, fixes):
+                    future.set_result(fix)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
 class CodeFixer:
     """Handles applying fixes to source code files"""
     
+    # Syntax results are cached by content hash: LLM retries often return the
+    # exact same code, and re-parsing a large file each time is wasted work.
+    _SYNTAX_CACHE_MAX = 64
+
     def __init__(self):
         self.backup_dir = Path("./code_backups")
         self.backup_dir.mkdir(exist_ok=True)
+        self._syntax_cache = OrderedDict()
     
     def apply_fix(self, fix_suggestion: FixSuggestion, create_backup: bool = True) -> Dict[str, bool]:
         """Apply fix suggestions to files"""
@@ -299,8 +898,16 @@ class CodeFixer:
                 
                 # Validate syntax before applying
                 if self._validate_python_syntax(new_content):
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
+                    # Pre-encoded single-shot write; skips the
+                    # TextIOWrapper/BufferedWriter layers for one blob
+                    # of known length
+                    data = new_content.encode('utf-8')
+                    fd = os.open(file_path,
+                                 os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                    try:
+                        os.write(fd, data)
+                    finally:
+                        os.close(fd)
                     results[file_path] = True
                 else:
                     results[file_path] = False
@@ -314,33 +921,93 @@ class CodeFixer:
     
     def _create_backup(self, file_path: str):
         """Create backup of original file"""
-        import shutil
-        from datetime import datetime
-        
         file_name = os.path.basename(file_path)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_name = f"{file_name}.backup_{timestamp}"
         backup_path = self.backup_dir / backup_name
-        
-        shutil.copy2(file_path, backup_path)
+
+        self._copy_file(file_path, str(backup_path))
         print(f"Backup created: {backup_path}")
+
+    @staticmethod
+    def _copy_file(src: str, dst: str):
+        """Byte-for-byte copy that keeps the data in the kernel.
+
+        os.copy_file_range never bounces bytes through userspace (and is
+        a pure reflink on xfs/btrfs); os.sendfile covers older kernels,
+        and shutil.copyfileobj is the portable last resort. mtime is
+        preserved so backups still sort like shutil.copy2 output.
+        """
+        st = os.stat(src)
+        sfd = os.open(src, os.O_RDONLY)
+        try:
+            dfd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                remaining = st.st_size
+                try:
+                    while remaining > 0:
+                        copied = os.copy_file_range(sfd, dfd, remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                except (AttributeError, OSError):
+                    # Rewind both fds - a partial copy_file_range may have
+                    # advanced them, and sendfile/copyfileobj write at the
+                    # destination's current offset
+                    os.lseek(sfd, 0, os.SEEK_SET)
+                    os.lseek(dfd, 0, os.SEEK_SET)
+                    os.ftruncate(dfd, 0)
+                    try:
+                        offset = 0
+                        while offset < st.st_size:
+                            sent = os.sendfile(dfd, sfd, offset, st.st_size - offset)
+                            if sent == 0:
+                                break
+                            offset += sent
+                    except (AttributeError, OSError):
+                        os.lseek(sfd, 0, os.SEEK_SET)
+                        os.lseek(dfd, 0, os.SEEK_SET)
+                        os.ftruncate(dfd, 0)
+                        with os.fdopen(os.dup(sfd), 'rb') as fsrc, \
+                                os.fdopen(os.dup(dfd), 'wb') as fdst:
+                            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+            finally:
+                os.close(dfd)
+        finally:
+            os.close(sfd)
+        # Match shutil.copy2: carry over permission bits and timestamps
+        os.chmod(dst, st.st_mode & 0o7777)
+        os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
     
     def _validate_python_syntax(self, code: str) -> bool:
-        """Validate Python syntax"""
+        """Validate Python syntax (results cached by content hash)"""
+        code_hash = hashlib.blake2b(code.encode('utf-8'), digest_size=16).digest()
+        cached = self._syntax_cache.get(code_hash)
+        if cached is not None:
+            self._syntax_cache.move_to_end(code_hash)
+            return cached
+
         try:
             ast.parse(code)
-            return True
+            valid = True
         except SyntaxError:
-            return False
+            valid = False
+
+        self._syntax_cache[code_hash] = valid
+        while len(self._syntax_cache) > self._SYNTAX_CACHE_MAX:
+            self._syntax_cache.popitem(last=False)
+        return valid
 
 
 class AutoDebugger:
     """Main class that orchestrates the debugging process"""
     
     def __init__(self, openrouter_api_key: str):
-        self.parser = StackTraceParser()
         self.extractor = CodeContextExtractor()
+        self.parser = StackTraceParser(self.extractor)
         self.analyzer = LLMAnalyzer(openrouter_api_key)
+        self.analyzer._prewarm()
+        self.batcher = ErrorBatcher(self.analyzer)
         self.fixer = CodeFixer()
     
     def debug_exception(self, exc_type, exc_value, exc_traceback) -> FixSuggestion:
@@ -356,6 +1023,32 @@ class AutoDebugger:
         
         return fix_suggestion
     
+    def submit_exception(self, exc_type, exc_value, exc_traceback) -> Future:
+        """Queue an exception for batched analysis, returning a Future.
+
+        Meant for high-frequency capture (e.g. an excepthook inside a
+        loop): identical errors share one Future, and distinct pending
+        errors get flushed together as one batched LLM call. For the
+        interactive path use debug_exception, which analyzes
+        immediately without the batching linger.
+        """
+        error_info = self.parser.parse_error(exc_type, exc_value, exc_traceback)
+        code_context = self.extractor.extract_context(error_info)
+        return self.batcher.submit(error_info, code_context)
+
+    def debug_exceptions(self, exc_infos) -> List[FixSuggestion]:
+        """Debug several captured exceptions as one concurrent batch.
+
+        Takes a list of (exc_type, exc_value, exc_traceback) tuples as
+        returned by sys.exc_info(). The LLM round-trips overlap via
+        analyze_many instead of serializing one network wait per error.
+        """
+        error_batches = []
+        for exc_type, exc_value, exc_traceback in exc_infos:
+            error_info = self.parser.parse_error(exc_type, exc_value, exc_traceback)
+            error_batches.append((error_info, self.extractor.extract_context(error_info)))
+        return self.analyzer.analyze_many(error_batches)
+
     def auto_fix_code(self, target_file: str) -> Optional[FixSuggestion]:
         """Run target file and attempt to fix any errors"""
         try:
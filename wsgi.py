@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for running the Auto Debugger under a production server.
+Run with: gunicorn -w 4 --preload --timeout 30 wsgi:app
+
+With --preload this module is imported once in the gunicorn master, so the
+rendered template (and any model/index state loaded at import time) is
+shared copy-on-write across all workers instead of being rebuilt per
+worker. The Werkzeug dev server in debug_web_ui.py remains for local use.
+"""
+
+from debug_web_ui import app, create_template
+
+# Write the template once at import time (in the master when preloading)
+create_template()
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=5000)